@@ -0,0 +1,93 @@
+#config.py
+import os
+import json
+import argparse
+from typing import Any, Dict, Iterable, Optional
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+ENV_PREFIX = 'EVOPIGENESIS_'
+
+# key -> (type, default, minimum, maximum); None means unbounded
+SCHEMA = {
+    'map_size': (int, 15, 2, None),
+    'max_wall_height': (int, 3, 0, None),
+    'food_spawn_rate': (float, 1.45, 0, None),
+    'energy_cost_per_meter': (float, 12, 0, None),
+    'metrics_enabled': (bool, False, None, None),
+    'metrics_port': (int, 9464, 1, 65535),
+    'replay_record': (bool, False, None, None),
+    'replay_path': (str, 'last_run.replay', None, None),
+    'lineage_path': (str, '', None, None),
+}
+
+# Parent parser for main.py's command line; never parsed on import
+ARG_PARSER = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+ARG_PARSER.add_argument('--config', metavar='PATH', help='config file to load instead of config.json')
+ARG_PARSER.add_argument('--set', metavar='KEY=VALUE', action='append', default=[],
+                        help='override a config value (repeatable)')
+
+
+def _coerce(key: str, value: Any) -> Any:
+    """Convert a raw value (possibly a string from env/CLI) to the key's type"""
+    kind = SCHEMA[key][0]
+    if isinstance(value, str) and kind is not str:
+        text = value.strip().lower()
+        if kind is bool:
+            if text in ('1', 'true', 'yes', 'on'):
+                return True
+            if text in ('0', 'false', 'no', 'off'):
+                return False
+            raise ValueError(f"{key}: expected a boolean, got {value!r}")
+        try:
+            return kind(text)
+        except ValueError:
+            raise ValueError(f"{key}: expected {kind.__name__}, got {value!r}") from None
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def validate(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Check types and ranges of known keys, raising ValueError listing every problem"""
+    problems = []
+    for key, (kind, _, minimum, maximum) in SCHEMA.items():
+        value = config[key]
+        if type(value) is not kind:
+            problems.append(f"{key}: expected {kind.__name__}, got {type(value).__name__}")
+            continue
+        if minimum is not None and value < minimum:
+            problems.append(f"{key}: must be >= {minimum}, got {value}")
+        if maximum is not None and value > maximum:
+            problems.append(f"{key}: must be <= {maximum}, got {value}")
+    if problems:
+        raise ValueError("Invalid configuration:\n  " + "\n  ".join(problems))
+    return config
+
+
+def load_config(path: Optional[str] = None, overrides: Iterable[str] = (), environ: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Build the config from defaults, the JSON file, environment and KEY=VALUE overrides (in that order)"""
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(ENV_PREFIX + 'CONFIG') or CONFIG_PATH
+
+    config = {key: default for key, (_, default, _, _) in SCHEMA.items()}
+    with open(path, 'r') as f:
+        config.update(json.load(f))
+
+    for key in SCHEMA:
+        if ENV_PREFIX + key.upper() in environ:
+            config[key] = environ[ENV_PREFIX + key.upper()]
+    for override in overrides:
+        key, sep, value = override.partition('=')
+        key = key.strip()
+        if not sep or key not in SCHEMA:
+            raise ValueError(f"Invalid override {override!r}; expected KEY=VALUE with KEY one of {', '.join(SCHEMA)}")
+        config[key] = value
+
+    for key in SCHEMA:
+        config[key] = _coerce(key, config[key])
+    return validate(config)
+
+
+# Loaded once on first import (defaults, file, environment) and shared by every
+# module. main.py applies --config/--set in place before the model modules load.
+config = load_config()
@@ -1,30 +1,38 @@
-import os
-import json
 import time
 import math
 import random
+import itertools
 from typing import List, Optional
-from ursina import Vec3, Entity, destroy, color
+from config import config
+# Engine names, bound by _load_engine() when the first food is built so this
+# module can be imported without Panda3D
+Entity = Vec3 = color = destroy = None
+
+
+def _load_engine() -> None:
+    global Entity, Vec3, color, destroy
+    if Entity is None:
+        from ursina import Entity, Vec3, color, destroy
 
 #--- Configuration ---
-# Load config first
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
-with open(CONFIG_PATH, 'r') as f:
-    config = json.load(f)
 # Set confguration variables
 map_size = config['map_size']
 
 class Food:
     """Class representing edible resources in the environment"""
+    __slots__ = ('uid', 'start_time', 'entity')
     instances: List['Food'] = []
     # Set confguration variables
     map_size = config['map_size']
     food_spawn_rate = config['food_spawn_rate']
+    energy_value: int = 50  # Same for every food item, so shared on the class
+    _ids = itertools.count()  # Stable per-run ids, used by the replay recorder
 
-    def __init__(self, position: Optional[Vec3] = None):
-        self.energy_value: int = 50
+    def __init__(self, position: Optional['Vec3'] = None):
+        _load_engine()
+        self.uid: int = next(Food._ids)
         self.start_time = time.time()
-        self.entity: Entity = Entity(
+        self.entity: 'Entity' = Entity(
             model='sphere',
             color=color.green,
             scale=0.2,
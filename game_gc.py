@@ -1,5 +1,70 @@
-from typing import List
-from ursina import Entity
+import sys
+from typing import Dict, List, Optional
+
+# Python values whose contents are walked when sizing an object. Ursina
+# entities get their own walk (see _entity_sizeof); other engine objects such as
+# Panda3D vectors and colors are counted at their Python wrapper size only.
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def _entity_sizeof(entity, seen: set) -> int:
+    """Bytes of an Entity, its attribute __dict__ and child entities (eyes, pupils).
+
+    Attribute values are sized shallowly so the walk doesn't wander into the
+    scene, models and other shared engine objects; `seen` counts those once.
+    """
+    size = sys.getsizeof(entity)
+    attrs = getattr(entity, '__dict__', None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs)
+        for value in attrs.values():
+            if id(value) not in seen:
+                seen.add(id(value))
+                size += sys.getsizeof(value)
+    for child in getattr(entity, 'children', ()):
+        if id(child) not in seen:
+            seen.add(id(child))
+            size += _entity_sizeof(child, seen)
+    return size
+
+
+def _deep_sizeof(obj, seen: set) -> int:
+    """Approximate heap bytes owned by obj, skipping shared objects already seen"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, _entity_type()):
+        return _entity_sizeof(obj, seen)
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    elif isinstance(obj, _CONTAINERS):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+    elif hasattr(type(obj), '__slots__'):
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                value = getattr(obj, slot, None)
+                # Referenced organisms/food/genomes are sized on their own
+                if value is not None and type(value).__module__ not in ('organism', 'food', 'genomics'):
+                    size += _deep_sizeof(value, seen)
+    return size
+
+
+def _entity_type():
+    """Ursina's Entity class if the engine is loaded (empty tuple otherwise, so isinstance is False)"""
+    ursina = sys.modules.get('ursina')
+    return getattr(ursina, 'Entity', ())
+
+
+def _average_size(objects: List, seen: Optional[set] = None) -> int:
+    if not objects:
+        return 0
+    seen = seen if seen is not None else set()
+    return sum(_deep_sizeof(o, seen) for o in objects) // len(objects)
+
 
 class GarbageCollector:
     """System for cleaning up destroyed entities and managing memory"""
@@ -24,9 +89,44 @@ class GarbageCollector:
         GarbageCollector.collect()
         
         # Clean up potential zombie entities
+        from ursina import Entity
         for e in [e for e in Entity.entities if not e.enabled]:
             e.removeNode()
             
         # Explicit memory management
         import gc
-        gc.collect()
\ No newline at end of file
+        gc.collect()
+    @staticmethod
+    def memory_report(organism_count: Optional[int] = None, verbose: bool = True) -> Dict[str, int]:
+        """Break down Python-side bytes per organism, food and genome.
+
+        Entities include their attribute dicts and child entities, but not the
+        geometry Panda3D holds natively; entity counts are reported alongside
+        so that scene-graph cost can be sized separately. Pass organism_count to project totals for a larger world.
+        """
+        from food import Food
+        from organism import Organism
+
+        organisms = Organism.instances
+        genomes = [o.genome for o in organisms]
+        report = {
+            'organisms': len(organisms),
+            'food': len(Food.instances),
+            'bytes_per_organism': _average_size(organisms),
+            'bytes_per_genome': _average_size(genomes),
+            'bytes_per_food': _average_size(Food.instances),
+            # Body plus two eyes and two pupils
+            'entities_per_organism': 5,
+            'entities_per_food': 1,
+        }
+        per_organism = report['bytes_per_organism'] + report['bytes_per_genome']
+        report['organism_total_bytes'] = per_organism * len(organisms)
+        report['food_total_bytes'] = report['bytes_per_food'] * len(Food.instances)
+        if organism_count is not None:
+            report['projected_organism_bytes'] = per_organism * organism_count
+
+        if verbose:
+            print("=== MEMORY REPORT ===")
+            for key, value in report.items():
+                print(f"{key}: {value}")
+        return report
\ No newline at end of file
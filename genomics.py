@@ -2,24 +2,24 @@
 import random
 
 from typing import Dict, Tuple
-from ursina import *
 
 class Genome:
     """Class representing a genetic blueprint for organisms"""
-    __slots__ = ('alleles', 'dominance_map')
+    __slots__ = ('alleles',)
+    # Dominance is identical for every genome, so one shared map is enough
+    dominance_map = {
+        'color': 0,
+        'sight_fov': 0,
+        'sight_range': 0,
+        'strength': 0,
+        'speed': 0,
+        'size': 1,
+        'default_energy': 0,
+        'metabolism': 0
+    }
     
     def __init__(self, alleles: Dict[str, Tuple[float, float]]):
         self.alleles = alleles
-        self.dominance_map = {
-            'color': 0,
-            'sight_fov': 0,
-            'sight_range': 0,
-            'strength': 0,
-            'speed': 0,
-            'size': 1,
-            'default_energy': 0,
-            'metabolism': 0
-        }
 
     @classmethod
     def random_genome(cls) -> 'Genome':
@@ -66,6 +66,7 @@ class Genome:
         
         # Format color differently
         if trait == 'color':
+            from ursina import color  # Only color expression needs the engine
             return color.hsv(a/255, b/255, 1)  # Now recognizes 'color'
             
         if dominant_idx in (0, 1):
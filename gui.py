@@ -1,5 +1,8 @@
+import math
+import time
 from ursina import *
 from ursina.prefabs.button import Button
+from population_stats import PopulationStats
 class InspectionOverlay(Entity):
     def __init__(self, **kwargs):
         super().__init__(
@@ -9,6 +12,8 @@ class InspectionOverlay(Entity):
             **kwargs
         )
         self.current_organism = None  # Initialize organism reference
+        self._genome_info = ""  # Genome never changes, so its text is built once per organism
+        self._last_state = None  # Inputs behind the text currently shown
 
         # Background panel
         self.background = Entity(
@@ -33,29 +38,120 @@ class InspectionOverlay(Entity):
 
     def update_info(self, organism=None):
         """Update with organism data"""
-        if organism:
+        if organism and organism is not self.current_organism:
             self.current_organism = organism  # Update organism reference
+            self._genome_info = "\n".join([f"{trait}: {round(organism.genome.express_trait(trait), 2)}" 
+                                          for trait in organism.genome.alleles])
+            self._last_state = None
         
         if not self.current_organism:
-            self.text.text = "No organism selected"
+            if self._last_state != 'empty':
+                self.text.text = "No organism selected"
+                self._last_state = 'empty'
             return
-            
-        genome_info = "\n".join([f"{trait}: {round(self.current_organism.genome.express_trait(trait), 2)}" 
-                               for trait in self.current_organism.genome.alleles])
+
+        state = (
+            self.current_organism,
+            self.current_organism.energy,
+            self.current_organism.mating_mode,
+            bool(self.current_organism.target_food),
+            tuple(round(v, 1) for v in self.current_organism.entity.position)
+        )
+        if state == self._last_state:
+            return  # Nothing visible changed, skip the text rebuild
+        self._last_state = state
+        _, energy, mating_mode, has_target, position = state
         
         state_info = f"""
-    Energy: {self.current_organism.energy}
-    Mode: {'MATING' if self.current_organism.mating_mode else 'HUNTING'}
-    Target: {'Food' if self.current_organism.target_food else 'None'}
-    Position: {tuple(round(v, 1) for v in self.current_organism.entity.position)}
+    Energy: {energy}
+    Mode: {'MATING' if mating_mode else 'HUNTING'}
+    Target: {'Food' if has_target else 'None'}
+    Position: {position}
         """.strip()
         
-        full_text = f"=== ORGANISM STATS ===\n{state_info}\n\n=== GENOME TRAITS ===\n{genome_info}"
+        full_text = f"=== ORGANISM STATS ===\n{state_info}\n\n=== GENOME TRAITS ===\n{self._genome_info}"
         self.text.text = full_text  # Update the text cleanly
 
     def toggle(self):
         self.enabled = not self.enabled
 
+class PopulationPanel(Entity):
+    """HUD panel showing population-wide stats and trait distributions"""
+    DENSITY = " .:-=+*#%@"  # Histogram bar glyphs, emptiest to fullest
+
+    def __init__(self, refresh_interval: float = 0.5, **kwargs):
+        super().__init__(
+            parent=camera.ui,  # Attach to the UI camera
+            position=(0.45, 0.45),  # Top-right corner of the screen
+            scale=(0.4, 0.6),  # Scale of the panel
+            **kwargs
+        )
+        self.refresh_interval = refresh_interval  # Seconds between stat checks
+        self._elapsed = refresh_interval  # Render on the first update
+        self._rendered_version = None  # PopulationStats.version behind the shown text
+        self._energy_line = None  # Energy summary as last shown (it drifts without a version bump)
+
+        # Background panel
+        self.background = Entity(
+            parent=self,
+            model='quad',
+            color=color.rgba(0, 0, 0, 0.8),  # Semi-transparent black
+            scale=(1, 1),
+            origin=(-0.5, 0.5),  # Top-left alignment
+            texture='white_cube'
+        )
+
+        # Text display
+        self.text = Text(
+            parent=self.background,
+            text="",
+            origin=(-0.5, 0.5),  # Top-left alignment
+            position=(0.05, -0.05),  # Padding
+            scale=(1.5, 1.5),
+            color=color.white,
+            font='VeraMono.ttf'  # Monospace keeps histogram bars aligned
+        )
+
+    @classmethod
+    def _bars(cls, key: str) -> str:
+        """Render a histogram as a row of density glyphs"""
+        bins = PopulationStats.histogram(key)
+        if not bins:
+            return ""
+        peak = max(n for _, n in bins) or 1
+        top = len(cls.DENSITY) - 1
+        return "".join(cls.DENSITY[math.ceil(n / peak * top)] for _, n in bins)
+
+    def update(self):
+        """Throttled refresh; text is only rebuilt when a displayed value changed"""
+        self._elapsed += time.dt
+        if self._elapsed < self.refresh_interval:
+            return
+        self._elapsed = 0
+        energy = PopulationStats.energy
+        energy_line = f"Energy: {energy.mean():.0f} +/- {math.sqrt(energy.variance()):.0f}"
+        if PopulationStats.version == self._rendered_version and energy_line == self._energy_line:
+            return
+        self._rendered_version = PopulationStats.version
+        self._energy_line = energy_line
+
+        lines = [
+            "=== POPULATION ===",
+            f"Alive: {PopulationStats.count}",
+            f"Hunting: {PopulationStats.modes['HUNTING']}  Mating: {PopulationStats.modes['MATING']}",
+            energy_line,
+            f"  |{self._bars('energy')}|",
+            "",
+            "=== TRAITS ==="
+        ]
+        for trait, acc in PopulationStats.traits.items():
+            lines.append(f"{trait}: {acc.mean():.2f} +/- {math.sqrt(acc.variance()):.2f}")
+            lines.append(f"  |{self._bars(trait)}|")
+        self.text.text = "\n".join(lines)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
 class Menu(Entity):
     def __init__(self, **kwargs):
         super().__init__(
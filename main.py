@@ -1,27 +1,37 @@
 #main.py
 # imports
-import os
-import json
+import argparse
 import time
 import random
+#--- Configuration ---
+# Apply command line overrides to the shared config before anything reads it
+from config import config, load_config, ARG_PARSER
+parser = argparse.ArgumentParser(description='EvoPiGenesis evolution simulator', parents=[ARG_PARSER], allow_abbrev=False)
+parser.add_argument('--replay', metavar='PATH', help='play back a recorded run instead of simulating')
+args = parser.parse_args()
+if args.config or args.set:
+    config.update(load_config(args.config, args.set))
 # ursina
 from ursina import *
 from ursina.prefabs.first_person_controller import FirstPersonController
 from ursina.shaders import lit_with_shadows_shader
 #local imports
-from gui import Menu, InspectionOverlay  # Import the Menu class
+from gui import Menu, InspectionOverlay, PopulationPanel  # Import the Menu class
 from organism import Organism
 from food import Food
 from game_gc import GarbageCollector
-#--- Configuration ---
-# Load config first
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
-with open(CONFIG_PATH, 'r') as f:
-    config = json.load(f)
+from metrics import Metrics
+from replay import ReplayRecorder, ReplayPlayer
+from phylogeny import lineage
 # Set confguration variables
 map_size = config['map_size']
 food_spawn_rate = config['food_spawn_rate']
 max_wall_height = config['max_wall_height']
+metrics_enabled = config['metrics_enabled']
+metrics_port = config['metrics_port']
+replay_record = config['replay_record']
+replay_path = config['replay_path']
+lineage_path = config['lineage_path']
 #Unused, don't remove: organism_speeds = config['organisms']['food_spawn_rate']
 
 # --- Initial declaration and setup ---
@@ -72,22 +82,35 @@ for x in range(-map_size, map_size + 1):  # Generate floor from -map_size to map
 
 # --- Hud overlay (creature inspection) ---
 inspection_overlay = InspectionOverlay(enabled=False)
+population_panel = PopulationPanel(enabled=not args.replay)  # Stats never update during playback
 
 
 
+# --- Replay (playback mode skips all simulation) ---
+replay_player = ReplayPlayer.from_file(args.replay) if args.replay else None
+replay_recorder = ReplayRecorder(replay_path) if replay_record and not replay_player else None
+
 """Initialize starting population of organisms"""
-for _ in range(10): #
-    Organism(
-        position=Vec3(random.uniform(-(map_size - 1), map_size - 1), 1, random.uniform(-(map_size - 1), map_size - 1)),
-        color=color.hsv(random.uniform(0, 360), 0.8, 0.8)
-    )
-for _ in range(40):
-    Food()
+if not replay_player:
+    for _ in range(10): #
+        Organism(
+            position=Vec3(random.uniform(-(map_size - 1), map_size - 1), 1, random.uniform(-(map_size - 1), map_size - 1)),
+            color=color.hsv(random.uniform(0, 360), 0.8, 0.8)
+        )
+    for _ in range(40):
+        Food()
+
+if metrics_enabled:
+    Metrics.start_server(metrics_port)
 
 
 def input(key):
     global menu_open
     if key == 'escape':
+        if replay_recorder:
+            replay_recorder.close()
+        if lineage_path and not replay_player:
+            lineage.save(lineage_path)
         application.quit()
     if key == 'tab':
         menu_open = not menu_open  # Toggle the menu state
@@ -95,21 +118,51 @@ def input(key):
         mouse.locked = not menu_open  # Toggle mouse lock
         mouse.visible = menu_open
         player.enabled = not menu_open  # Toggle player movement
+    if key == 'p' and not replay_player:
+        population_panel.toggle()  # Show/hide population stats
+    if key == 'm':
+        GarbageCollector.memory_report()  # Print per-object memory footprint
     if key == 'left mouse down':
-        if mouse.hovered_entity and isinstance(mouse.hovered_entity.parent, Organism):
-            Organism.selected_organism = mouse.hovered_entity.parent
+        if Organism.hovered_organism:
+            Organism.select(Organism.hovered_organism)
             inspection_overlay.update_info(Organism.selected_organism)  # Update overlay with organism data
             inspection_overlay.enabled = True
         else:
             if Organism.selected_organism:
-                Organism.selected_organism.is_selected = False
-                Organism.selected_organism = None
+                Organism.select(None)
                 inspection_overlay.enabled = False
+    if replay_player:
+        # Playback controls: k pause, r reverse, up/down speed, left/right skip 10 recorded seconds
+        if key == 'k':
+            replay_player.paused = not replay_player.paused
+        if key == 'r':
+            replay_player.speed = -replay_player.speed
+        if key == 'up arrow':
+            replay_player.speed *= 2
+        if key == 'down arrow':
+            replay_player.speed /= 2
+        if key in ('left arrow', 'right arrow'):
+            replay_player.skip(10 if key == 'right arrow' else -10)
+            elapsed, total = replay_player.seconds()
+            print(f"Replay at {elapsed:.0f}s / {total:.0f}s (speed x{replay_player.speed:g})")
 
 def update():
     """Main game loop handling all real-time updates"""
     global menu_open
+    tick_start = time.perf_counter()
     
+    # Keep player in bounds (prevent falling)
+    if player.y < -10:
+        player.position = (0, 10, 0)
+
+    # Playback only drives the renderer, no organism AI runs
+    if replay_player:
+        replay_player.update(time.dt)
+        return
+    lineage.advance()
+    # Resolve hover once per frame; only organisms whose state changes get a color write
+    Organism.update_hover(mouse.hovered_entity)
+
     # Update HUD text with game stats
 
     # Update inspection overlay
@@ -118,9 +171,6 @@ def update():
         inspection_overlay.enabled = True
     else:
         inspection_overlay.enabled = False
-    # Keep player in bounds (prevent falling)
-    if player.y < -10:
-        player.position = (0, 10, 0)
 
     # Food spawning system
     if random.random() < food_spawn_rate * time.dt:
@@ -140,5 +190,9 @@ def update():
     if time.time() % 5 < time.dt:
         GarbageCollector.collect()
 
+    if replay_recorder:
+        replay_recorder.record_tick(time.dt, Organism.instances, Food.instances)
+    Metrics.record_tick(time.perf_counter() - tick_start, len(Organism.instances), len(Food.instances))
+
 
 app.run()
\ No newline at end of file
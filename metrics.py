@@ -0,0 +1,146 @@
+#metrics.py
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from population_stats import PopulationStats
+
+
+class Metrics:
+    """Incrementally maintained simulation counters with a Prometheus-style exporter"""
+    births: int = 0
+    deaths: int = 0
+    population: int = 0
+    food: int = 0
+    births_per_second: float = 0.0
+    deaths_per_second: float = 0.0
+    tick_times: deque = deque(maxlen=1000)  # Recent tick durations, for quantiles only
+    tick_count: int = 0  # Cumulative, for the summary's _count
+    tick_seconds_total: float = 0.0  # Cumulative, for the summary's _sum
+
+    _lock = threading.Lock()
+    _server: Optional[ThreadingHTTPServer] = None
+    _window_start: float = time.perf_counter()
+    _window_births: int = 0
+    _window_deaths: int = 0
+
+    @classmethod
+    def record_birth(cls) -> None:
+        with cls._lock:
+            cls.births += 1
+
+    @classmethod
+    def record_death(cls) -> None:
+        with cls._lock:
+            cls.deaths += 1
+
+    @classmethod
+    def record_tick(cls, duration: float, population: int, food: int) -> None:
+        """Record one main-loop tick and refresh the per-second rates"""
+        now = time.perf_counter()
+        with cls._lock:
+            cls.tick_times.append(duration)
+            cls.tick_count += 1
+            cls.tick_seconds_total += duration
+            cls.population = population
+            cls.food = food
+            elapsed = now - cls._window_start
+            if elapsed >= 1.0:
+                cls.births_per_second = (cls.births - cls._window_births) / elapsed
+                cls.deaths_per_second = (cls.deaths - cls._window_deaths) / elapsed
+                cls._window_start = now
+                cls._window_births = cls.births
+                cls._window_deaths = cls.deaths
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], q: float) -> float:
+        if not sorted_values:
+            return 0.0
+        index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+        return sorted_values[index]
+
+    @classmethod
+    def render(cls) -> str:
+        """Format the current counters in the Prometheus text exposition format"""
+        # Trait stats are maintained by PopulationStats on birth and death
+        traits = PopulationStats.trait_snapshot()
+        with cls._lock:
+            ticks = sorted(cls.tick_times)
+            lines = [
+                "# HELP evopigenesis_population Living organisms",
+                "# TYPE evopigenesis_population gauge",
+                f"evopigenesis_population {cls.population}",
+                "# HELP evopigenesis_food Food items in the world",
+                "# TYPE evopigenesis_food gauge",
+                f"evopigenesis_food {cls.food}",
+                "# HELP evopigenesis_births_total Organisms created since start",
+                "# TYPE evopigenesis_births_total counter",
+                f"evopigenesis_births_total {cls.births}",
+                "# HELP evopigenesis_deaths_total Organisms that died since start",
+                "# TYPE evopigenesis_deaths_total counter",
+                f"evopigenesis_deaths_total {cls.deaths}",
+                "# HELP evopigenesis_births_per_second Births over the last rate window",
+                "# TYPE evopigenesis_births_per_second gauge",
+                f"evopigenesis_births_per_second {cls.births_per_second:.4f}",
+                "# HELP evopigenesis_deaths_per_second Deaths over the last rate window",
+                "# TYPE evopigenesis_deaths_per_second gauge",
+                f"evopigenesis_deaths_per_second {cls.deaths_per_second:.4f}",
+                "# HELP evopigenesis_tick_seconds Main loop tick duration percentiles",
+                "# TYPE evopigenesis_tick_seconds summary",
+            ]
+            for q in (0.5, 0.9, 0.99):
+                lines.append(f'evopigenesis_tick_seconds{{quantile="{q}"}} {cls._percentile(ticks, q):.6f}')
+            lines.append(f"evopigenesis_tick_seconds_sum {cls.tick_seconds_total:.6f}")
+            lines.append(f"evopigenesis_tick_seconds_count {cls.tick_count}")
+
+            lines.append("# HELP evopigenesis_trait_mean Mean expressed trait value across living organisms")
+            lines.append("# TYPE evopigenesis_trait_mean gauge")
+            for trait, (mean, _) in traits.items():
+                lines.append(f'evopigenesis_trait_mean{{trait="{trait}"}} {mean:.6f}')
+            lines.append("# HELP evopigenesis_trait_variance Variance of expressed trait value across living organisms")
+            lines.append("# TYPE evopigenesis_trait_variance gauge")
+            for trait, (_, variance) in traits.items():
+                lines.append(f'evopigenesis_trait_variance{{trait="{trait}"}} {variance:.6f}')
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def start_server(cls, port: int = 9464) -> None:
+        """Serve /metrics on localhost from a background daemon thread.
+
+        A port that can't be bound (already in use, no permission) only prints
+        a warning; the simulation runs on without the exporter.
+        """
+        if cls._server:
+            return
+        try:
+            cls._server = ThreadingHTTPServer(('127.0.0.1', port), _MetricsHandler)
+        except OSError as e:
+            print(f"Warning: metrics server not started on port {port}: {e}")
+            return
+        thread = threading.Thread(target=cls._server.serve_forever, name='metrics-server', daemon=True)
+        thread.start()
+        print(f"Metrics available at http://127.0.0.1:{port}/metrics")
+
+    @classmethod
+    def stop_server(cls) -> None:
+        if cls._server:
+            cls._server.shutdown()
+            cls._server.server_close()
+            cls._server = None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = Metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the console
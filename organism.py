@@ -1,45 +1,82 @@
 #organism.py
-import os
-import json
-from typing import List, Optional, TYPE_CHECKING
-from ursina import *
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from enum import IntEnum
 from genomics import Genome
 import math
 import random
 import time
 from food import Food
+from metrics import Metrics
+from population_stats import PopulationStats
+from phylogeny import lineage
+from config import config
+if TYPE_CHECKING:
+    from ursina import Color
+
+# Engine names, bound by _load_engine() when the first organism is built so the
+# model (stats, lineage, visual state) can be imported without Panda3D
+Entity = Vec3 = colors = raycast = lerp = clamp = destroy = None
+
+
+def _load_engine() -> None:
+    global Entity, Vec3, colors, raycast, lerp, clamp, destroy
+    if Entity is None:
+        from ursina import Entity, Vec3, color as colors, raycast, lerp, clamp, destroy
 debug=True
 #--- Configuration ---
-# Load config first
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
-with open(CONFIG_PATH, 'r') as f:
-    config = json.load(f)
 # Set confguration variables
 energy_cost_per_meter = config['energy_cost_per_meter']
 
+class VisualState(IntEnum):
+    """What an organism's body color currently shows"""
+    NORMAL = 0
+    HOVERED = 1
+    SELECTED = 2
+    MATING = 3
+
 class Organism:
     """Class representing autonomous biological entities"""
+    __slots__ = (
+        'uid', 'genome', 'default_energy', '_energy', '_mating_mode', 'target_food',
+        'last_x', 'last_y', 'last_z', 'wander_dx', 'wander_dz', 'next_wander_time',
+        'sight_fov', 'sight_range', 'strength', 'speed', 'size',
+        'entity', 'original_color', 'is_selected', 'alive', 'visual_state'
+    )
     instances: List['Organism'] = []
     selected_organism = None  # Class-level tracking
-    HOVER_COLOR = color.Color(1, 1, 0, 0.5)  # 50% transparent yellow
+    hovered_organism = None  # Resolved once per frame from mouse.hovered_entity
+    by_entity: Dict['Entity', 'Organism'] = {}  # Body entity -> organism, for mouse picking
+    HOVER_COLOR = (1, 1, 0, 0.5)  # 50% transparent yellow (RGBA)
+    # Shared tuning constants (kept on the class so they cost nothing per instance)
+    wander_duration = 1.5  # How long to move in one direction
+    wander_speed_multiplier = 1  # Slower movement when wandering
+    min_height = 0.7  # Minimum height above the ground
+    max_height = 1.5  # Maximum height above the ground
     def __init__(
         self,
-        position: Vec3 = Vec3(0, 0, 0),
+        position: Optional['Vec3'] = None,
         genome: Optional[Genome] = None,
-        color: color.Color = color.lime
+        color: Optional['Color'] = None,
+        parents: Optional[Tuple['Organism', 'Organism']] = None
     ):
+        _load_engine()
+        position = position if position is not None else Vec3(0, 0, 0)
+        color = color if color is not None else colors.lime
         self.genome = genome or Genome.random_genome()
+        # Lineage ids double as stable per-run ids (used by the replay recorder)
+        self.uid: int = lineage.register(self.genome, (parents[0].uid, parents[1].uid) if parents else None)
         self.default_energy = self.genome.express_trait('default_energy')
-        self.energy: int = self.default_energy
-        self.mating_mode: bool = False
+        # Set the backing fields directly; PopulationStats picks them up on registration
+        self._energy: int = self.default_energy
+        self._mating_mode: bool = False
         self.target_food: Optional['Food'] = None
-        self.last_position: Vec3 = Vec3(position.x, position.y, position.z)  # Fixed copy
-        
-
-        self.wander_target = None
+        # Plain floats rather than Vec3s, so no engine object is held per organism
+        self.last_x: float = position.x
+        self.last_y: float = position.y
+        self.last_z: float = position.z
+        self.wander_dx: float = 0.0  # Unit heading on the ground plane
+        self.wander_dz: float = 0.0
         self.next_wander_time = 0
-        self.wander_duration = 1.5  # How long to move in one direction
-        self.wander_speed_multiplier = 1  # Slower movement when wandering
         # Expressed traits
         self.sight_fov = math.radians(self.genome.express_trait('sight_fov'))
         self.sight_range = self.genome.express_trait('sight_range')
@@ -48,8 +85,6 @@ class Organism:
         self.size = self.genome.express_trait('size')
         
         # Initialize entity
-        self.min_height = 0.7  # Minimum height above the ground
-        self.max_height = 1.5  # Maximum height above the ground
         self.entity = Entity(
             position=position,
             model='sphere',
@@ -59,24 +94,88 @@ class Organism:
             texture='white_cube'
         )
         self.original_color = color
+        self.visual_state = VisualState.NORMAL  # Matches the color the entity was created with
         self._add_eyes()
         Organism.instances.append(self)
-        # Click detection for on_select(self)
+        PopulationStats.add(self)
+        self.alive = True
+        if parents:
+            Metrics.record_birth()  # Seeded founders are spawns, not births
+        # Clicks are resolved through Organism.by_entity (see main.input)
         self.entity.collider = 'sphere'
-        self.entity.on_click = self.on_select
+        Organism.by_entity[self.entity] = self
         self.is_selected = False
 
-    def on_select(self):
-        # Deselect previous organism
-        if Organism.selected_organism:
-            Organism.selected_organism.is_selected = False
-            Organism.selected_organism.entity.color = Organism.selected_organism.original_color  # Reset color
-        
-        # Select this organism
-        self.is_selected = True
-        Organism.selected_organism = self
-        self.entity.color = color.cyan  # Visual feedback for selection
+    @property
+    def energy(self) -> float:
+        return self._energy
 
+    @energy.setter
+    def energy(self, value: float) -> None:
+        if self.alive and value != self._energy:
+            PopulationStats.energy_changed(self._energy, value)
+        self._energy = value
+
+    @property
+    def mating_mode(self) -> bool:
+        return self._mating_mode
+
+    @mating_mode.setter
+    def mating_mode(self, value: bool) -> None:
+        changed = value != self._mating_mode
+        self._mating_mode = value
+        if changed and self.alive:
+            PopulationStats.mode_changed(value)
+            self.refresh_visual()
+
+    @classmethod
+    def select(cls, organism: Optional['Organism']) -> None:
+        """Change the selected organism (None to deselect)"""
+        previous = cls.selected_organism
+        if previous is organism:
+            return
+        cls.selected_organism = organism
+        if previous:
+            previous.is_selected = False
+            previous.refresh_visual()
+        if organism:
+            organism.is_selected = True
+            organism.refresh_visual()
+
+    @classmethod
+    def update_hover(cls, hovered_entity: Optional['Entity']) -> None:
+        """Resolve the hovered organism once per frame from mouse.hovered_entity"""
+        organism = cls.by_entity.get(hovered_entity) if hovered_entity else None
+        previous = cls.hovered_organism
+        if previous is organism:
+            return
+        cls.hovered_organism = organism
+        if previous:
+            previous.refresh_visual()
+        if organism:
+            organism.refresh_visual()
+
+    def refresh_visual(self) -> None:
+        """Recompute the visual state and write the color only if it changed"""
+        if self.is_selected:
+            state = VisualState.SELECTED
+        elif Organism.hovered_organism is self:
+            state = VisualState.HOVERED
+        elif self._mating_mode:
+            state = VisualState.MATING
+        else:
+            state = VisualState.NORMAL
+        if state == self.visual_state or not self.entity:
+            return
+        self.visual_state = state
+        if state == VisualState.SELECTED:
+            self.entity.color = colors.cyan
+        elif state == VisualState.HOVERED:
+            self.entity.color = colors.Color(*Organism.HOVER_COLOR)
+        elif state == VisualState.MATING:
+            self.entity.color = colors.pink
+        else:
+            self.entity.color = self.original_color
 
 
 
@@ -92,7 +191,7 @@ class Organism:
             eye = Entity(
                 parent=self.entity,
                 model='sphere',
-                color=color.white,
+                color=colors.white,
                 scale=eye_scale,
                 position=offset,
                 collider=None
@@ -100,7 +199,7 @@ class Organism:
             Entity(
                 parent=eye,
                 model='sphere',
-                color=color.black,
+                color=colors.black,
                 scale=0.8 * eye_scale,
                 position=Vec3(0, 0, 0.5),
                 collider=None
@@ -111,10 +210,6 @@ class Organism:
             self.die()
             return
 
-        # Reset color if deselected
-        if not self.is_selected and self.entity.color == color.cyan:
-            self.entity.color = self.original_color
-
         # Behavior chain
         if not self.mating_mode:
             self._hunt_behavior()  # Ensure _hunt_behavior is called every frame
@@ -124,53 +219,43 @@ class Organism:
         else:
             self._mate_behavior()
 
-        # Hover highlighting
-        if self.entity.hovered:
-            self.entity.color = Organism.HOVER_COLOR
-        else:
-            self.entity.color = self.original_color
         # Handle energy cost for movement
         self._handle_energy_cost()
     def _wander(self):
         """Random exploration behavior when no food is detected"""
         current_time = time.time()
         if current_time > self.next_wander_time:
-            angle = random.uniform(0, 360)
-            self.wander_target = Vec3(
-                math.sin(math.radians(angle)),
-                0,
-                math.cos(math.radians(angle))
-            ).normalized()
+            angle = math.radians(random.uniform(0, 360))
+            self.wander_dx = math.sin(angle)
+            self.wander_dz = math.cos(angle)
             self.next_wander_time = current_time + random.uniform(2.0, 4.0)
-            self.last_position = Vec3(self.entity.position)
+            self.last_x, self.last_y, self.last_z = self.entity.position
 
-        if self.wander_target:
-            # Calculate target rotation angle
-            target_angle = math.degrees(math.atan2(-self.wander_target.x, self.wander_target.z))
-            # Smooth rotation using lerp
-            self.entity.rotation_y = lerp(self.entity.rotation_y, target_angle, 5 * time.dt)
-            
-            # Move in the forward direction (now aligned with rotation)
-            move_direction = self.entity.forward.normalized()
-            move_amount = move_direction * self.speed * self.wander_speed_multiplier * time.dt
-            collision_ray = raycast(
-                self.entity.position + Vec3(0, self.size * 0.75, 0), # Start from center height
-                move_direction,
-                distance=move_amount.length(),
-                ignore=[self.entity],
-                debug=debug,
-            )
-            if not collision_ray.hit:
-                self.entity.position += move_amount
-            # Calculate rotation using direction-to-angle conversion
-            target_angle = math.degrees(math.atan2(-self.wander_target.x, self.wander_target.z))
-
-            # Smooth rotation with quaternion slerp
-            self.entity.rotation = lerp(
-                self.entity.rotation,
-                Vec3(0, target_angle, 0),
-                5 * time.dt
-            )
+        # The first call always picks a heading (next_wander_time starts at 0)
+        # Calculate target rotation angle
+        target_angle = math.degrees(math.atan2(-self.wander_dx, self.wander_dz))
+        # Smooth rotation using lerp
+        self.entity.rotation_y = lerp(self.entity.rotation_y, target_angle, 5 * time.dt)
+        
+        # Move in the forward direction (now aligned with rotation)
+        move_direction = self.entity.forward.normalized()
+        move_amount = move_direction * self.speed * self.wander_speed_multiplier * time.dt
+        collision_ray = raycast(
+            self.entity.position + Vec3(0, self.size * 0.75, 0), # Start from center height
+            move_direction,
+            distance=move_amount.length(),
+            ignore=[self.entity],
+            debug=debug,
+        )
+        if not collision_ray.hit:
+            self.entity.position += move_amount
+
+        # Smooth rotation with quaternion slerp
+        self.entity.rotation = lerp(
+            self.entity.rotation,
+            Vec3(0, target_angle, 0),
+            5 * time.dt
+        )
 
         # Maintain fixed height
         self.entity.y = clamp(self.entity.y, self.min_height, self.max_height)
@@ -201,15 +286,16 @@ class Organism:
         self.last_position = Vec3(self.entity.position.x, self.entity.position.y, self.entity.position.z)'''
     def _handle_energy_cost(self) -> None:
         """Calculate and deduct movement energy costs based on distance, energy cost per meter, and metabolism."""
-        distance_moved = math.dist(self.entity.position, self.last_position)
+        position = self.entity.position
+        distance_moved = math.dist(position, (self.last_x, self.last_y, self.last_z))
         metabolism = self.genome.express_trait('metabolism')
         total_energy_cost = distance_moved * energy_cost_per_meter * metabolism
         
         #print(f"Distance moved: {distance_moved}, Metabolism: {metabolism}, Energy cost: {total_energy_cost}")
         
         self.energy -= int(total_energy_cost)
-        self.last_position = Vec3(self.entity.position.x, self.entity.position.y, self.entity.position.z)
-    def _vision_check(self, target_pos: Vec3) -> bool:
+        self.last_x, self.last_y, self.last_z = position
+    def _vision_check(self, target_pos: 'Vec3') -> bool:
         """Check if target is within field of view"""
         direction_to_target = (target_pos - self.entity.position).normalized()
         # Calculate the forward vector based on the entity's rotation
@@ -331,7 +417,6 @@ class Organism:
         """Enter mating mode if successful"""
         if random.random() < probability:
             self.mating_mode = True
-            self.entity.color = color.pink
             self.target_food = None
 
     def _mate_behavior(self) -> None:
@@ -367,7 +452,8 @@ class Organism:
             Organism(
                 position=start_pos,
                 genome=new_genome,
-                color=lerp(self.original_color, mate.original_color, 0.5)
+                color=lerp(self.original_color, mate.original_color, 0.5),
+                parents=(self, mate)
             )
             
         self._stop_mating()
@@ -376,12 +462,20 @@ class Organism:
     def _stop_mating(self) -> None:
         """Exit mating mode"""
         self.mating_mode = False
-        self.entity.color = self.original_color
         self.target_food = None
 
     def die(self) -> None:
         """Handle organism death"""
         if self in Organism.instances:
             Organism.instances.remove(self)
+            PopulationStats.remove(self)
+            self.alive = False
+            Metrics.record_death()
+            lineage.record_death(self.uid)
+        if Organism.hovered_organism is self:
+            Organism.hovered_organism = None
+        if self.is_selected:
+            Organism.select(None)  # Don't leave the overlay reading a destroyed entity
         if self.entity:
+            Organism.by_entity.pop(self.entity, None)
             destroy(self.entity)
\ No newline at end of file
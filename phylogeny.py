@@ -0,0 +1,210 @@
+#phylogeny.py
+import struct
+from array import array
+from typing import List, Optional, Set, Tuple
+
+# Allele layout of the flattened genome table, two values per trait
+GENOME_TRAITS = (
+    'color', 'sight_fov', 'sight_range', 'strength',
+    'speed', 'size', 'metabolism', 'default_energy'
+)
+NO_PARENT = -1
+ALIVE = -1  # death_tick of an organism that is still alive
+
+_MAGIC = b'EVOPHYL1'
+_HEADER = struct.Struct('<8sQQ')  # magic, record count, alleles per record
+
+
+class LineageStore:
+    """Array-backed family tree of every organism that ever lived.
+
+    Ids are dense indices into the tables. Children are threaded through two
+    sibling link columns (one per parent slot), so walking a parent's children
+    needs no per-record lists. Every record also carries a bitmask of the
+    founders it descends from, which turns founder queries into a bit test.
+
+    Other queries are not constant time: ancestors() and non-founder
+    living_descendants() visit every record in their result, and
+    most_recent_common_ancestor() scans the ids between the pair and the answer.
+    """
+
+    def __init__(self):
+        self.tick: int = 0
+        self.parent1 = array('q')
+        self.parent2 = array('q')
+        self.birth_tick = array('q')
+        self.death_tick = array('q')
+        self.alleles = array('d')  # len(GENOME_TRAITS) * 2 values per record
+        self.first_child = array('q')
+        self.next_sibling1 = array('q')  # Next child sharing parent1
+        self.next_sibling2 = array('q')  # Next child sharing parent2
+        self.founder_masks: List[int] = []
+        self.founders: List[int] = []  # Founder ids, indexed by mask bit
+        self.living: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.birth_tick)
+
+    # --- Recording ---
+    def register(self, genome, parents: Optional[Tuple[int, int]] = None, birth_tick: Optional[int] = None) -> int:
+        """Add a newly born organism and return its lineage id"""
+        values = []
+        for trait in GENOME_TRAITS:
+            values.extend(genome.alleles[trait])
+        return self._append(parents, self.tick if birth_tick is None else birth_tick, ALIVE, values)
+
+    def record_death(self, organism_id: int) -> None:
+        if self.death_tick[organism_id] == ALIVE:
+            self.death_tick[organism_id] = self.tick
+            self.living.discard(organism_id)
+
+    def advance(self) -> None:
+        """Move to the next simulation tick"""
+        self.tick += 1
+
+    def _append(self, parents: Optional[Tuple[int, int]], birth: int, death: int, values) -> int:
+        organism_id = len(self.birth_tick)
+        p1, p2 = parents if parents else (NO_PARENT, NO_PARENT)
+        self.parent1.append(p1)
+        self.parent2.append(p2)
+        self.birth_tick.append(birth)
+        self.death_tick.append(death)
+        self.alleles.extend(values)
+        self.first_child.append(NO_PARENT)
+        self.next_sibling1.append(NO_PARENT)
+        self.next_sibling2.append(NO_PARENT)
+
+        if p1 == NO_PARENT:
+            self.founder_masks.append(1 << len(self.founders))
+            self.founders.append(organism_id)
+        else:
+            self.founder_masks.append(self.founder_masks[p1] | self.founder_masks[p2])
+            # Push onto the front of each parent's child list
+            self.next_sibling1[organism_id] = self.first_child[p1]
+            self.first_child[p1] = organism_id
+            if p2 != p1:
+                self.next_sibling2[organism_id] = self.first_child[p2]
+                self.first_child[p2] = organism_id
+        if death == ALIVE:
+            self.living.add(organism_id)
+        return organism_id
+
+    # --- Queries ---
+    def parents(self, organism_id: int) -> Tuple[int, ...]:
+        return tuple(p for p in (self.parent1[organism_id], self.parent2[organism_id]) if p != NO_PARENT)
+
+    def children(self, organism_id: int) -> List[int]:
+        result = []
+        child = self.first_child[organism_id]
+        while child != NO_PARENT:
+            result.append(child)
+            child = self.next_sibling1[child] if self.parent1[child] == organism_id else self.next_sibling2[child]
+        return result
+
+    def is_alive(self, organism_id: int) -> bool:
+        return self.death_tick[organism_id] == ALIVE
+
+    def ancestors(self, organism_id: int) -> Set[int]:
+        """All ancestors of an organism, not including itself"""
+        seen: Set[int] = set()
+        stack = list(self.parents(organism_id))
+        parent1, parent2 = self.parent1, self.parent2
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            p1 = parent1[current]
+            if p1 != NO_PARENT:
+                stack.append(p1)
+                stack.append(parent2[current])
+        return seen
+
+    def living_descendants(self, organism_id: int) -> List[int]:
+        """Living organisms descended from organism_id"""
+        if self.parent1[organism_id] == NO_PARENT:
+            # Founders have a mask bit, so this is a single pass over the living
+            bit = self.founder_masks[organism_id]
+            return sorted(i for i in self.living if i != organism_id and self.founder_masks[i] & bit)
+
+        result, seen = [], set()
+        stack = self.children(organism_id)
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if self.death_tick[current] == ALIVE:
+                result.append(current)
+            stack.extend(self.children(current))
+        return sorted(result)
+
+    def most_recent_common_ancestor(self, a: int, b: int) -> Optional[int]:
+        """Latest-born organism that both a and b descend from (or are).
+
+        Cost is linear in max(a, b) minus the answer's id: fast when the pair
+        shares a recent ancestor, slow when their lineages only meet far back.
+        """
+        if not self.founder_masks[a] & self.founder_masks[b]:
+            return None  # No founder in common, so no shared ancestry at all
+        # Parents always have smaller ids than their children, so walking ids
+        # downwards settles each record's reach (bit 1: from a, bit 2: from b)
+        # before it is visited. Ancestry in a breeding population is dense, so
+        # a flat byte table beats a heap of just the reached records.
+        reached = bytearray(max(a, b) + 1)
+        reached[a] |= 1
+        reached[b] |= 2
+        parent1, parent2 = self.parent1, self.parent2
+        for current in range(max(a, b), -1, -1):
+            mask = reached[current]
+            if not mask:
+                continue
+            if mask == 3:
+                return current
+            p1 = parent1[current]
+            if p1 != NO_PARENT:
+                reached[p1] |= mask
+                reached[parent2[current]] |= mask
+        return None
+
+    def genome(self, organism_id: int):
+        """Rebuild the Genome of a recorded organism"""
+        from genomics import Genome
+        width = len(GENOME_TRAITS) * 2
+        values = self.alleles[organism_id * width:(organism_id + 1) * width]
+        return Genome({trait: (values[i * 2], values[i * 2 + 1]) for i, trait in enumerate(GENOME_TRAITS)})
+
+    # --- Persistence ---
+    def save(self, path: str) -> None:
+        """Write the tables to a compact binary file"""
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, len(self), len(GENOME_TRAITS) * 2))
+            for column in (self.parent1, self.parent2, self.birth_tick, self.death_tick, self.alleles):
+                f.write(column.tobytes())
+        print(f"Saved lineage of {len(self)} organisms to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'LineageStore':
+        """Read a saved store and rebuild its child and founder indexes"""
+        with open(path, 'rb') as f:
+            magic, count, width = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a lineage file")
+            columns = []
+            for typecode, length in (('q', count), ('q', count), ('q', count), ('q', count), ('d', count * width)):
+                column = array(typecode)
+                column.fromfile(f, length)
+                columns.append(column)
+
+        store = cls()
+        parent1, parent2, birth, death, alleles = columns
+        for i in range(count):
+            store._append(
+                None if parent1[i] == NO_PARENT else (parent1[i], parent2[i]),
+                birth[i], death[i], alleles[i * width:(i + 1) * width]
+            )
+        store.tick = max(max(birth, default=0), max(death, default=0))
+        return store
+
+
+lineage = LineageStore()  # Shared store for the running simulation
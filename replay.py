@@ -0,0 +1,317 @@
+#replay.py
+import gzip
+import math
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+from typing import BinaryIO, Dict, List, Tuple
+
+POSITION_SCALE = 100  # Positions stored in centimetres
+ROTATION_SCALE = 10  # Rotations stored in tenths of a degree
+KEYFRAME_INTERVAL = 300  # Ticks between full snapshots (and file flushes)
+
+# Object kinds, packed into the low bit of a replay key
+ORGANISM = 0
+FOOD = 1
+# State flag bits
+FLAG_MATING = 1
+
+# File layout (gzip-compressed, little-endian): a header followed by a stream
+# of tagged records. Every field is a plain number, so loading never runs code.
+_MAGIC = b'EVOREPL3'
+_TICK = b'T'
+_KEYFRAME = b'K'
+_TICK_HEADER = struct.Struct('<dIIII')  # dt, spawns, despawns, transforms, flags
+_SPAWN = struct.Struct('<qf4B')  # key, scale, rgba
+_FLAG = struct.Struct('<qB')  # key, flags
+_KEYFRAME_HEADER = struct.Struct('<QI')  # tick, entries
+_ENTRY = struct.Struct('<qf4B4iB')  # key, scale, rgba, x, y, z, rot, flags
+
+
+def _key(kind: int, uid: int) -> int:
+    return uid << 1 | kind
+
+
+def _quantize_color(c) -> Tuple[int, int, int, int]:
+    return tuple(max(0, min(255, round(c[i] * 255))) for i in range(4))
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise EOFError
+    return data
+
+
+class ReplayRecorder:
+    """Streams compact per-tick deltas of the live world to a replay file.
+
+    Each tick stores (dt, spawns, despawns, transform keys, transform values, flags):
+      spawns     -- (key, scale, rgba) for objects that appeared
+      despawns   -- keys of objects that disappeared
+      transforms -- array('q') of keys for moved organisms, then a parallel
+                    array('i') of [x, y, z, rotation_y] per key (keys are
+                    64-bit so long runs can't overflow them)
+      flags      -- (key, flags) for objects whose state flags changed
+    Food never moves, so its transform is only written when it spawns; the
+    bob/spin animation is recreated during playback. A full snapshot is written
+    every KEYFRAME_INTERVAL ticks for fast seeking, and the file is flushed
+    then, so a crash loses at most the ticks since the last keyframe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tick_count = 0
+        self._file = gzip.open(path, 'wb')
+        self._file.write(_MAGIC)
+        self._state: Dict[int, list] = {}  # key -> [scale, rgba, x, y, z, rot, flags]
+
+    def record_tick(self, dt: float, organisms: List, foods: List) -> None:
+        """Diff the current world against the previous tick and write the delta"""
+        spawns, flags = [], []
+        transform_keys, transforms = array('q'), array('i')
+        seen = set()
+
+        for kind, objects in ((ORGANISM, organisms), (FOOD, foods)):
+            for obj in objects:
+                entity = obj.entity
+                if not entity:
+                    continue
+                key = _key(kind, obj.uid)
+                seen.add(key)
+                previous = self._state.get(key)
+                if kind == FOOD and previous is not None:
+                    continue  # Static apart from its animation
+
+                pos = entity.position
+                transform = [
+                    round(pos.x * POSITION_SCALE),
+                    round(pos.y * POSITION_SCALE),
+                    round(pos.z * POSITION_SCALE),
+                    round(entity.rotation_y * ROTATION_SCALE)
+                ]
+                state_flags = FLAG_MATING if kind == ORGANISM and obj.mating_mode else 0
+
+                if previous is None:
+                    rgba = _quantize_color(obj.original_color if kind == ORGANISM else entity.color)
+                    spawns.append((key, entity.scale_x, rgba))
+                    self._state[key] = [entity.scale_x, rgba] + transform + [state_flags]
+                    transform_keys.append(key)
+                    transforms.extend(transform)
+                    if state_flags:
+                        flags.append((key, state_flags))
+                    continue
+
+                if previous[2:6] != transform:
+                    previous[2:6] = transform
+                    transform_keys.append(key)
+                    transforms.extend(transform)
+                if previous[6] != state_flags:
+                    previous[6] = state_flags
+                    flags.append((key, state_flags))
+
+        despawns = array('q', [key for key in self._state if key not in seen])
+        for key in despawns:
+            del self._state[key]
+
+        write = self._file.write
+        write(_TICK + _TICK_HEADER.pack(dt, len(spawns), len(despawns), len(transform_keys), len(flags)))
+        for key, scale, rgba in spawns:
+            write(_SPAWN.pack(key, scale, *rgba))
+        write(despawns.tobytes())
+        write(transform_keys.tobytes())
+        write(transforms.tobytes())
+        for key, state_flags in flags:
+            write(_FLAG.pack(key, state_flags))
+
+        tick = self.tick_count
+        self.tick_count += 1
+        if tick % KEYFRAME_INTERVAL == 0:
+            write(_KEYFRAME + _KEYFRAME_HEADER.pack(tick, len(self._state)))
+            for key, (scale, rgba, x, y, z, rot, state_flags) in self._state.items():
+                write(_ENTRY.pack(key, scale, *rgba, x, y, z, rot, state_flags))
+            self._file.flush(zlib.Z_SYNC_FLUSH)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+            print(f"Saved replay with {self.tick_count} ticks to {self.path}")
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """Read a replay file, keeping every complete record before any truncation"""
+        ticks: List[tuple] = []
+        keyframes: Dict[int, Dict[int, list]] = {}
+        with gzip.open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a replay file")
+            try:
+                while True:
+                    tag = f.read(1)
+                    if not tag:
+                        break
+                    if tag == _TICK:
+                        dt, n_spawns, n_despawns, n_transforms, n_flags = _TICK_HEADER.unpack(_read_exact(f, _TICK_HEADER.size))
+                        spawns = []
+                        for _ in range(n_spawns):
+                            key, scale, *rgba = _SPAWN.unpack(_read_exact(f, _SPAWN.size))
+                            spawns.append((key, scale, tuple(rgba)))
+                        despawns = array('q')
+                        despawns.frombytes(_read_exact(f, n_despawns * despawns.itemsize))
+                        transform_keys = _read_exact(f, n_transforms * despawns.itemsize)
+                        transforms = _read_exact(f, n_transforms * 4 * array('i').itemsize)
+                        flags = [_FLAG.unpack(_read_exact(f, _FLAG.size)) for _ in range(n_flags)]
+                        ticks.append((dt, spawns, list(despawns), transform_keys, transforms, flags))
+                    elif tag == _KEYFRAME:
+                        tick, count = _KEYFRAME_HEADER.unpack(_read_exact(f, _KEYFRAME_HEADER.size))
+                        snapshot = {}
+                        for _ in range(count):
+                            key, scale, r, g, b, a, x, y, z, rot, state_flags = _ENTRY.unpack(_read_exact(f, _ENTRY.size))
+                            snapshot[key] = [scale, (r, g, b, a), x, y, z, rot, state_flags]
+                        keyframes[tick] = snapshot
+                    else:
+                        raise ValueError(f"{path}: unknown record tag {tag!r}")
+            except EOFError:
+                pass  # Recording was cut off (crash or kill); keep what was flushed
+        # Drop keyframes that point past the last complete tick
+        keyframes = {tick: snapshot for tick, snapshot in keyframes.items() if tick < len(ticks)}
+        return {'ticks': ticks, 'keyframes': keyframes}
+
+
+def apply_tick(state: Dict[int, list], record: tuple) -> None:
+    """Apply one recorded tick to a key -> [scale, rgba, x, y, z, rot, flags] state"""
+    _, spawns, despawns, transform_keys, transforms, flags = record
+    for key, scale, rgba in spawns:
+        state[key] = [scale, rgba, 0, 0, 0, 0, 0]
+    for key in despawns:
+        state.pop(key, None)
+    keys, values = array('q'), array('i')
+    keys.frombytes(transform_keys)
+    values.frombytes(transforms)
+    for i, key in enumerate(keys):
+        entry = state.get(key)
+        if entry is not None:
+            entry[2:6] = values[i * 4:i * 4 + 4]
+    for key, state_flags in flags:
+        if key in state:
+            state[key][6] = state_flags
+
+
+class ReplayPlayer:
+    """Plays a recorded run back through the renderer without running any AI"""
+
+    def __init__(self, data: dict, speed: float = 1.0):
+        self.ticks: List[tuple] = data['ticks']
+        self.keyframes: Dict[int, Dict[int, list]] = data['keyframes']
+        self._keyframe_ticks = sorted(self.keyframes)
+        self.speed = speed  # Recorded seconds per real second
+        self.paused = False
+        self.tick = -1  # Last applied tick
+        self._clock = 0.0
+        self._anim_time = 0.0  # Drives the food bob/spin, which is not recorded
+        self._state: Dict[int, list] = {}
+        self._entities: Dict[int, object] = {}
+        self._applied: Dict[int, tuple] = {}  # key -> (x, y, z, rot, flags) last pushed to the entity
+
+    @classmethod
+    def from_file(cls, path: str, speed: float = 1.0) -> 'ReplayPlayer':
+        return cls(ReplayRecorder.load(path), speed)
+
+    def seek(self, tick: int) -> None:
+        """Jump to the end of the given tick via the nearest earlier keyframe"""
+        tick = max(-1, min(tick, len(self.ticks) - 1))
+        index = bisect_right(self._keyframe_ticks, tick) - 1
+        if index >= 0 and not (self.tick <= tick and self._keyframe_ticks[index] <= self.tick):
+            start = self._keyframe_ticks[index]
+            self._state = {key: list(value) for key, value in self.keyframes[start].items()}
+        elif self.tick > tick:
+            start = -1
+            self._state = {}
+        else:
+            start = self.tick  # Rolling forward from where we are is cheaper
+        for t in range(start + 1, tick + 1):
+            apply_tick(self._state, self.ticks[t])
+        self.tick = tick
+        self._clock = 0.0
+        self._sync()
+
+    def skip(self, seconds: float) -> None:
+        """Seek forwards or backwards by an amount of recorded time"""
+        target, remaining = self.tick, abs(seconds)
+        step = 1 if seconds > 0 else -1
+        while remaining > 0 and -1 <= target + step < len(self.ticks):
+            target += step
+            remaining -= self.ticks[max(target, 0)][0]
+        self.seek(target)
+
+    def update(self, dt: float) -> None:
+        """Advance playback by dt real seconds"""
+        if self.paused or not self.ticks:
+            return
+        self._animate_food(dt)
+        if self.speed < 0:
+            # Walk backwards through recorded tick lengths, then seek there
+            self._clock += dt * -self.speed
+            target = self.tick
+            while target > 0 and self._clock >= self.ticks[target][0]:
+                self._clock -= self.ticks[target][0]
+                target -= 1
+            if target != self.tick:
+                clock = self._clock
+                self.seek(target)
+                self._clock = clock
+            return
+
+        self._clock += dt * self.speed
+        advanced = False
+        while self.tick + 1 < len(self.ticks) and self._clock >= self.ticks[self.tick + 1][0]:
+            self.tick += 1
+            self._clock -= self.ticks[self.tick][0]
+            apply_tick(self._state, self.ticks[self.tick])
+            advanced = True
+        if advanced:
+            self._sync()
+
+    def _animate_food(self, dt: float) -> None:
+        """Recreate Food.update's bob and spin, offset per item so they don't move in lockstep"""
+        self._anim_time += dt * abs(self.speed)
+        for key, entity in self._entities.items():
+            if key & 1 == FOOD:
+                t = self._anim_time + key
+                entity.y = 0.8 + (math.sin(t * 3) * 0.2)
+                entity.rotation_y = t * 50
+
+    def _sync(self) -> None:
+        """Push the replay state into the scene graph, touching only what changed"""
+        from ursina import Entity, Vec3, destroy, color
+
+        for key in [k for k in self._entities if k not in self._state]:
+            destroy(self._entities.pop(key))
+            self._applied.pop(key, None)
+
+        for key, (scale, rgba, x, y, z, rot, state_flags) in self._state.items():
+            entity = self._entities.get(key)
+            if entity is None:
+                entity = Entity(
+                    model='sphere',
+                    color=color.Color(*(v / 255 for v in rgba)),
+                    scale=scale,
+                    texture='white_cube'
+                )
+                self._entities[key] = entity
+            applied = (x, y, z, rot, state_flags)
+            if self._applied.get(key) == applied:
+                continue
+            entity.position = Vec3(x, y, z) / POSITION_SCALE
+            entity.rotation_y = rot / ROTATION_SCALE
+            if key & 1 == ORGANISM:
+                entity.color = color.pink if state_flags & FLAG_MATING else color.Color(*(v / 255 for v in rgba))
+            self._applied[key] = applied
+
+    def seconds(self) -> Tuple[float, float]:
+        """Return (elapsed, total) recorded seconds"""
+        elapsed = sum(record[0] for record in self.ticks[:self.tick + 1])
+        total = sum(record[0] for record in self.ticks)
+        return elapsed, total